@@ -95,7 +95,9 @@ COMPRESSION_HDF5_NOTES_DOC = """It is possible to enable other compression filte
     files will require installing the package providing the compression filter
     and it may thus not be possible to load it on some platforms.
     Only ``compression=None`` and ``compression='gzip'`` are available on all
-    platforms. For more details, see the `h5py documentation
+    platforms. The ``'lzf'`` filter is always available with h5py, but other
+    software using the HDF5 library requires the lzf filter plugin to read
+    these files. For more details, see the `h5py documentation
     <https://docs.h5py.org/en/stable/faq.html#what-compression-processing-filters-are-supported>`_.
     """
 
@@ -37,6 +37,9 @@ not_valid_format = "The file is not a valid HyperSpy hdf5 file"
 
 _logger = logging.getLogger(__name__)
 
+# translation table replacing the "/" of signal titles used as group names
+_SLASH_TRANS = str.maketrans("/", "-")
+
 
 def get_signal_chunks(shape, dtype, signal_axes=None, target_size=1e6):
     """
@@ -124,7 +127,6 @@ class HierarchicalReader:
         self.Dataset = None
         self.Group = None
         self.unicode_kwds = None
-        self.ragged_kwds = None
 
         if self.version > Version(version):
             warnings.warn(
@@ -197,13 +199,11 @@ class HierarchicalReader:
         exp_dict_list = []
 
         if "Experiments" in self.file:
-            for ds in self.file["Experiments"]:
-                if isinstance(self.file["Experiments"][ds], self.Group):
-                    if "data" in self.file["Experiments"][ds]:
-                        experiments.append(ds)
+            for exg in self.file["Experiments"].values():
+                if isinstance(exg, self.Group) and "data" in exg:
+                    experiments.append(exg)
             # Parse the file
-            for experiment in experiments:
-                exg = self.file["Experiments"][experiment]
+            for exg in experiments:
                 exp = self.group2signaldict(exg, lazy)
                 # assign correct models, if found:
                 _tmp = {}
@@ -513,11 +513,12 @@ class HierarchicalReader:
             else:
                 dictionary[key] = value
         if not isinstance(group, self.Dataset):
-            for key in group.keys():
+            # Iterate over the items to open each child only once
+            for key, item in group.items():
                 if key.startswith("_sig_"):
-                    dictionary[key] = self.group2signaldict(group[key])
-                elif isinstance(group[key], self.Dataset):
-                    dat = group[key]
+                    dictionary[key] = self.group2signaldict(item)
+                elif isinstance(item, self.Dataset):
+                    dat = item
                     kn = key
                     if key.startswith("_list_"):
                         if h5py.check_string_dtype(dat.dtype) and hasattr(dat, "asstr"):
@@ -549,14 +550,14 @@ class HierarchicalReader:
                     dictionary[key] = [
                         i
                         for k, i in sorted(
-                            iter(self._group2dict(group[key], lazy=lazy).items())
+                            iter(self._group2dict(item, lazy=lazy).items())
                         )
                     ]
                 elif key.startswith("_list_"):
                     dictionary[key[7 + key[6:].find("_") :]] = [
                         i
                         for k, i in sorted(
-                            iter(self._group2dict(group[key], lazy=lazy).items())
+                            iter(self._group2dict(item, lazy=lazy).items())
                         )
                     ]
                 elif key.startswith("_tuple_"):
@@ -564,13 +565,13 @@ class HierarchicalReader:
                         [
                             i
                             for k, i in sorted(
-                                iter(self._group2dict(group[key], lazy=lazy).items())
+                                iter(self._group2dict(item, lazy=lazy).items())
                             )
                         ]
                     )
                 else:
                     dictionary[key] = {}
-                    self._group2dict(group[key], dictionary[key], lazy=lazy)
+                    self._group2dict(item, dictionary[key], lazy=lazy)
 
         return dictionary
 
@@ -603,7 +604,7 @@ class HierarchicalWriter:
         self.Dataset = None
         self.Group = None
         self.unicode_kwds = None
-        self.ragged_kwds = None
+        self.store_kwds = {}
         self.kwds = kwds
 
     @staticmethod
@@ -615,7 +616,9 @@ class HierarchicalWriter:
         raise NotImplementedError("This method must be implemented by subclasses.")
 
     @classmethod
-    def overwrite_dataset(cls, group, data, key, signal_axes=None, chunks=None, **kwds):
+    def overwrite_dataset(
+        cls, group, data, key, signal_axes=None, chunks=None, store_kwds=None, **kwds
+    ):
         """
         Overwrites a dataset into a hierarchical structure following the h5py
         API.
@@ -635,6 +638,8 @@ class HierarchicalWriter:
             the chunks of the dask array will be used otherwise the chunks
             will be determined by the
             :py:func:`~.io_plugins._hierarchical.get_signal_chunks` function.
+        store_kwds : dict, None
+            Any additional keywords to be passed to the ``_store_data`` method.
         kwds : dict
             Any additional keywords for to be passed to the
             :py:meth:`h5py.Group.require_dataset` or
@@ -644,12 +649,24 @@ class HierarchicalWriter:
             if isinstance(data, da.Array):
                 # For lazy dataset, by default, we use the current dask chunking
                 chunks = tuple([c[0] for c in data.chunks])
+            elif data.dtype == np.dtype("O"):
+                # For ragged dataset, use the average size of the first arrays,
+                # so that a chunk references about `target_size` bytes
+                size = np.mean([np.asarray(a).nbytes for a in data.flat[:100]])
+                chunks = get_signal_chunks(
+                    data.shape,
+                    np.dtype((np.void, max(int(size), 1))),
+                    signal_axes=(),
+                    target_size=cls.target_size,
+                )
             else:
                 # If signal_axes=None, use automatic h5py chunking, otherwise
                 # optimise the chunking to contain at least one signal per chunk
                 chunks = get_signal_chunks(
                     data.shape, data.dtype, signal_axes, cls.target_size
                 )
+        if store_kwds is None:
+            store_kwds = {}
         if np.issubdtype(data.dtype, np.dtype("U")):
             # Saving numpy unicode type is not supported in h5py
             data = data.astype(np.dtype("S"))
@@ -690,11 +707,16 @@ class HierarchicalWriter:
                 group, shapes, "ragged_shapes", shapes.shape, **kwds
             )
             cls._store_data(
-                shapes, shape_dset, group, "ragged_shapes", chunks=shapes.shape
+                shapes,
+                shape_dset,
+                group,
+                "ragged_shapes",
+                chunks=shapes.shape,
+                **store_kwds,
             )
-            cls._store_data(new_data, dset, group, key, chunks)
+            cls._store_data(new_data, dset, group, key, chunks, **store_kwds)
         else:
-            cls._store_data(data, dset, group, key, chunks)
+            cls._store_data(data, dset, group, key, chunks, **store_kwds)
 
     def write(self):
         self.write_signal(self.signal, self.group, **self.kwds)
@@ -727,6 +749,7 @@ class HierarchicalWriter:
                     if not axis["navigate"]
                 ],
                 chunks=chunks,
+                store_kwds=self.store_kwds,
                 **kwds,
             )
 
@@ -752,7 +775,9 @@ class HierarchicalWriter:
             if isinstance(value, dict):
                 self.dict2group(value, group.require_group(key), **kwds)
             elif isinstance(value, (np.ndarray, self.Dataset, da.Array)):
-                self.overwrite_dataset(group, value, key, **kwds)
+                self.overwrite_dataset(
+                    group, value, key, store_kwds=self.store_kwds, **kwds
+                )
 
             elif value is None:
                 group.attrs[key] = "_None_"
@@ -16,23 +16,42 @@
 # You should have received a copy of the GNU General Public License
 # along with RosettaSciIO. If not, see <https://www.gnu.org/licenses/#GPL>.
 
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+import inspect
 import logging
+import os
 from packaging.version import Version
 from pathlib import Path
+import zlib
 
+import dask
 import dask.array as da
 import h5py
+import numpy as np
+
+try:
+    # registers the filters of hdf5plugin, for example Blosc, when imported
+    import hdf5plugin
+except ImportError:
+    hdf5plugin = None
 
 from rsciio._docstrings import (
     CHUNKS_DOC,
-    COMPRESSION_HDF5_DOC,
     COMPRESSION_HDF5_NOTES_DOC,
     FILENAME_DOC,
     LAZY_DOC,
     RETURNS_DOC,
     SIGNAL_DOC,
 )
-from rsciio._hierarchical import HierarchicalWriter, HierarchicalReader, version
+from rsciio._hierarchical import (
+    HierarchicalWriter,
+    HierarchicalReader,
+    get_signal_chunks,
+    version,
+    _SLASH_TRANS,
+)
 from rsciio.utils.tools import get_file_handle
 
 
@@ -43,6 +62,232 @@ not_valid_format = "The file is not a valid HyperSpy hdf5 file"
 current_file_version = None  # Format version of the file being read
 default_version = Version(version)
 
+# keyword arguments of file_writer passed to h5py.File instead of
+# h5py.Group.require_dataset
+_FILE_KWARGS = frozenset(
+    name
+    for name, param in inspect.signature(h5py.File.__init__).parameters.items()
+    if param.kind is param.POSITIONAL_OR_KEYWORD and name not in ("self", "name")
+)
+
+
+def _get_compression_kwds(compression, kwds):
+    """
+    Translate the ``compression`` argument of :py:func:`file_writer` into
+    the keyword arguments of :py:meth:`h5py.Group.require_dataset`.
+
+    Blosc compression can be specified as ``"blosc"`` or ``"blosc:<cname>"``,
+    for example ``"blosc:lz4"``, and Blosc2 compression as ``"blosc2"`` or
+    ``"blosc2:<cname>"``; they require the ``hdf5plugin`` library.
+    """
+    filter_name = compression.split(":")[0] if isinstance(compression, str) else None
+    if filter_name in ("blosc", "blosc2"):
+        if hdf5plugin is None:
+            raise ValueError(
+                f"Using `compression='{compression}'` requires the hdf5plugin "
+                "library."
+            )
+        clevel = kwds.pop("compression_opts", 5)
+        # the blosc filters do the shuffling themselves
+        if filter_name == "blosc":
+            cname = compression.partition(":")[2] or "lz4"
+            kwds.update(
+                hdf5plugin.Blosc(
+                    cname=cname, clevel=clevel, shuffle=hdf5plugin.Blosc.SHUFFLE
+                )
+            )
+        else:
+            # use the vectorised bit shuffle of Blosc2
+            cname = compression.partition(":")[2] or "zstd"
+            kwds.update(
+                hdf5plugin.Blosc2(
+                    cname=cname, clevel=clevel, filters=hdf5plugin.Blosc2.BITSHUFFLE
+                )
+            )
+        return kwds
+
+    if compression == "lzf" and "compression_opts" in kwds:
+        _logger.warning(
+            "The lzf compression filter doesn't accept any options, "
+            "`compression_opts` is ignored."
+        )
+        del kwds["compression_opts"]
+    kwds["compression"] = compression
+    if compression == "gzip" and "shuffle" not in kwds:
+        # Use shuffle by default to improve compression
+        kwds["shuffle"] = True
+
+    return kwds
+
+
+_VLEN_STR_KWDS = {"dtype": h5py.special_dtype(vlen=str)}
+
+
+@lru_cache(maxsize=None)
+def _vlen_dtype(dtype):
+    """Return the h5py variable length dtype of ``dtype``."""
+    return h5py.special_dtype(vlen=dtype)
+
+
+# Registered identifier of the Blosc HDF5 filter and the compressors
+# ordered by their code in the filter parameters
+_BLOSC_ID = 32001
+_BLOSC_CNAMES = ("blosclz", "lz4", "lz4hc", "snappy", "zlib", "zstd")
+
+
+def _shuffle(buf, itemsize):
+    """Reorder the bytes of ``buf`` like the HDF5 shuffle filter."""
+    return np.frombuffer(buf, dtype=np.uint8).reshape((-1, itemsize)).T.tobytes()
+
+
+def _get_chunk_encoder(dset, blosc_only=False):
+    """
+    Return a function encoding a chunk of ``dset`` into the bytes produced by
+    the HDF5 filter pipeline of the dataset, so that compressed chunks can be
+    written directly with :py:meth:`h5py.h5d.DatasetID.write_direct_chunk`.
+
+    Return None if the dataset doesn't use any filter or if the filter
+    pipeline can't be reproduced, for example because the library providing
+    a filter is not installed. If ``blosc_only`` is True, also return None if
+    the dataset is not compressed with Blosc.
+    """
+    if dset.chunks is None or dset.dtype.kind not in "biufc":
+        return None
+    itemsize = dset.dtype.itemsize
+    dcpl = dset.id.get_create_plist()
+    encoders = []
+    uses_blosc = False
+    for i in range(dcpl.get_nfilters()):
+        code, _, cd_values, _ = dcpl.get_filter(i)
+        if code == h5py.h5z.FILTER_SHUFFLE:
+            encoders.append(partial(_shuffle, itemsize=itemsize))
+        elif code == h5py.h5z.FILTER_DEFLATE:
+            encoders.append(partial(zlib.compress, level=cd_values[0]))
+        elif code == _BLOSC_ID:
+            try:
+                import blosc
+            except ImportError:
+                return None
+            uses_blosc = True
+            # Use the defaults of the Blosc HDF5 filter for missing parameters
+            params = tuple(cd_values[4:7])
+            clevel, shuffle, compcode = params + (5, 1, 0)[len(params) :]
+            encoders.append(
+                partial(
+                    blosc.compress,
+                    typesize=itemsize,
+                    clevel=clevel,
+                    shuffle=shuffle,
+                    cname=_BLOSC_CNAMES[compcode],
+                )
+            )
+        else:
+            return None
+
+    if not encoders or (blosc_only and not uses_blosc):
+        return None
+
+    def encode(chunk):
+        if chunk.shape != dset.chunks:
+            # edge chunks are stored with the full chunk shape
+            padded = np.zeros(dset.chunks, dtype=dset.dtype)
+            padded[tuple(slice(0, size) for size in chunk.shape)] = chunk
+            chunk = padded
+        buf = np.ascontiguousarray(chunk, dtype=dset.dtype).tobytes()
+        for encoder in encoders:
+            buf = encoder(buf)
+        return buf
+
+    return encode
+
+
+def _chunks_aligned(chunks, dset_chunks):
+    """
+    Return True if each chunk of an HDF5 dataset with chunks ``dset_chunks``
+    is contained in a single block of a dask array with chunks ``chunks``,
+    i.e. if the boundaries of the blocks are multiples of the HDF5 chunks.
+    """
+    return all(
+        all(boundary % dset_chunk == 0 for boundary in np.cumsum(dim_chunks[:-1]))
+        for dim_chunks, dset_chunk in zip(chunks, dset_chunks)
+    )
+
+
+def _store_dask_compressed(data, dset, encode):
+    """
+    Compress the blocks of a dask array in the dask workers and write the
+    compressed chunks directly. Each chunk of ``dset`` must be contained in
+    a single block of ``data``, see :py:func:`_chunks_aligned`.
+    """
+
+    def write_block(block, offset):
+        # h5py serialises the calls to the HDF5 library
+        for index in np.ndindex(
+            *(-(-s // c) for s, c in zip(block.shape, dset.chunks))
+        ):
+            sl = tuple(slice(i * c, (i + 1) * c) for i, c in zip(index, dset.chunks))
+            dset.id.write_direct_chunk(
+                tuple(o + s.start for o, s in zip(offset, sl)), encode(block[sl])
+            )
+
+    blocks = data.to_delayed()
+    starts = [np.cumsum((0,) + dim_chunks[:-1]) for dim_chunks in data.chunks]
+    tasks = [
+        dask.delayed(write_block)(
+            blocks[index], tuple(int(st[i]) for st, i in zip(starts, index))
+        )
+        for index in np.ndindex(blocks.shape)
+    ]
+    dask.compute(*tasks)
+
+
+# Smaller arrays, such as those of the metadata, are compressed by the HDF5
+# library, which is faster than starting a thread pool
+_PARALLEL_COMPRESSION_SIZE = 2**20
+
+
+def _store_compressed(data, dset, encode):
+    """
+    Compress the chunks of a numpy array in a thread pool and write the
+    compressed chunks directly from the calling thread.
+    """
+    max_workers = os.cpu_count()
+
+    def encode_chunk(sl):
+        return tuple(s.start for s in sl), encode(data[sl])
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Limit the number of compressed chunks waiting to be written
+        futures = deque()
+        for sl in dset.iter_chunks():
+            futures.append(executor.submit(encode_chunk, sl))
+            if len(futures) > 2 * max_workers:
+                dset.id.write_direct_chunk(*futures.popleft().result())
+        while futures:
+            dset.id.write_direct_chunk(*futures.popleft().result())
+
+
+def _get_page_size(signal, chunks, target_size):
+    """
+    Return a file space page size larger than the largest chunk of the data,
+    as a power of two of at least 4 MiB.
+    """
+    data = signal["data"]
+    if isinstance(chunks, tuple):
+        chunk_shape = chunks
+    elif isinstance(data, da.Array) and chunks is None:
+        # the dask chunks are used when saving
+        chunk_shape = [max(c) for c in data.chunks]
+    else:
+        signal_axes = [
+            i for i, axis in enumerate(signal["axes"]) if not axis["navigate"]
+        ]
+        chunk_shape = get_signal_chunks(
+            data.shape, data.dtype, signal_axes, target_size
+        )
+    nbytes = np.prod(chunk_shape, dtype=int) * data.dtype.itemsize
+    return int(2 ** max(22, np.ceil(np.log2(max(nbytes, 1)))))
+
 
 class HyperspyReader(HierarchicalReader):
     _file_type = "hspy"
@@ -51,7 +296,7 @@ class HyperspyReader(HierarchicalReader):
         super().__init__(file)
         self.Dataset = h5py.Dataset
         self.Group = h5py.Group
-        self.unicode_kwds = {"dtype": h5py.special_dtype(vlen=str)}
+        self.unicode_kwds = _VLEN_STR_KWDS
 
 
 class HyperspyWriter(HierarchicalWriter):
@@ -60,23 +305,43 @@ class HyperspyWriter(HierarchicalWriter):
     writing a hyperspy signal.  (.hspy format)
     """
 
-    target_size = 1e6
+    # Large chunks are faster to compress, particularly with Blosc, which
+    # only uses several threads for buffers much larger than its block size
+    target_size = 1e7
 
-    def __init__(self, file, signal, expg, **kwds):
+    def __init__(self, file, signal, expg, parallel_compression=False, **kwds):
         super().__init__(file, signal, expg, **kwds)
         self.Dataset = h5py.Dataset
         self.Group = h5py.Group
-        self.unicode_kwds = {"dtype": h5py.special_dtype(vlen=str)}
-        self.ragged_kwds = {"dtype": h5py.special_dtype(vlen=signal["data"][0].dtype)}
+        self.unicode_kwds = _VLEN_STR_KWDS
+        self.store_kwds = {"parallel_compression": parallel_compression}
 
     @staticmethod
-    def _store_data(data, dset, group, key, chunks):
+    def _store_data(data, dset, group, key, chunks, parallel_compression=False):
+        encode = None
         if isinstance(data, da.Array):
-            if data.chunks != dset.chunks:
+            # The other filters are applied by the HDF5 library in the dask
+            # workers, only the Blosc compression is done outside of HDF5
+            encode = _get_chunk_encoder(dset, blosc_only=True)
+        elif parallel_compression and data.nbytes >= _PARALLEL_COMPRESSION_SIZE:
+            encode = _get_chunk_encoder(dset)
+        if isinstance(data, da.Array):
+            # Blocks made of whole HDF5 chunks can be written as they are,
+            # otherwise merge them, so that chunks are not written partially
+            if dset.chunks is None or not _chunks_aligned(data.chunks, dset.chunks):
                 data = data.rechunk(dset.chunks)
-            da.store(data, dset)
-        elif data.flags.c_contiguous:
+            if encode is not None:
+                _store_dask_compressed(data, dset, encode)
+            else:
+                da.store(data, dset)
+        elif encode is not None:
+            _store_compressed(data, dset, encode)
+        elif isinstance(data, np.ndarray) and data.flags.c_contiguous:
             dset.write_direct(data)
+        elif dset.chunks is not None:
+            # Write chunk by chunk to avoid copying the whole array at once
+            for sl in dset.iter_chunks():
+                dset.write_direct(np.ascontiguousarray(data[sl]), dest_sel=sl)
         else:
             dset[:] = data
 
@@ -84,10 +349,12 @@ class HyperspyWriter(HierarchicalWriter):
     def _get_object_dset(group, data, key, chunks, **kwds):
         """Creates a h5py dataset object for saving ragged data"""
         # For saving ragged array
-        if chunks is None:
-            chunks = 1
         dset = group.require_dataset(
-            key, chunks, dtype=h5py.special_dtype(vlen=data[0].dtype), **kwds
+            key,
+            data.shape,
+            dtype=_vlen_dtype(data.flat[0].dtype),
+            chunks=chunks,
+            **kwds,
         )
         return dset
 
@@ -106,11 +373,6 @@ def file_reader(filename, lazy=False, **kwds):
 
     %s
     """
-    try:
-        # in case blosc compression is used
-        import hdf5plugin
-    except ImportError:
-        pass
     mode = kwds.pop("mode", "r")
     f = h5py.File(filename, mode=mode, **kwds)
 
@@ -129,9 +391,13 @@ def file_writer(
     filename,
     signal,
     chunks=None,
-    compression="gzip",
+    compression="lzf",
     close_file=True,
     write_dataset=True,
+    parallel_compression=False,
+    cloud_optimized=False,
+    direct_io=False,
+    chunk_cache_bytes=0,
     **kwds,
 ):
     """
@@ -142,7 +408,25 @@ def file_writer(
     %s
     %s
     %s
-    %s
+    compression : None, 'lzf', 'gzip', 'szip', 'blosc', 'blosc:<cname>', 'blosc2', 'blosc2:<cname>', default='lzf'
+        Compression can significantly increase the saving speed. If file size is not
+        an issue, it can be disabled by setting ``compression=None``.
+        RosettaSciIO uses h5py for reading and writing HDF5 files and, therefore,
+        it supports all `compression filters supported by h5py
+        <https://docs.h5py.org/en/stable/high/dataset.html#dataset-compression>`_.
+        The default ``'lzf'`` is much faster than ``'gzip'`` at the cost of a
+        slightly lower compression ratio. Use ``'gzip'`` for archiving or when the
+        file needs to be read with software not using h5py, as ``'lzf'`` is only
+        shipped with h5py. ``'blosc'`` and ``'blosc:<cname>'`` (for example
+        ``'blosc:lz4'`` or ``'blosc:zstd'``) use the Blosc filter from
+        `hdf5plugin <https://github.com/silx-kit/hdf5plugin>`_ with byte
+        shuffling. Similarly, ``'blosc2'`` and ``'blosc2:<cname>'`` use the
+        Blosc2 filter with bit shuffling, which is faster and usually gives
+        better compression ratios for floating point data.
+        The number of threads used by Blosc can be set with the
+        ``BLOSC_NTHREADS`` environment variable. With ``'gzip'``, the
+        shuffle filter is enabled unless ``shuffle`` is given. Also see
+        notes below.
     close_file : bool, default=True
         Close the file after writing.  The file should not be closed if the data
         needs to be accessed lazily after saving.
@@ -150,9 +434,52 @@ def file_writer(
         If True, write the dataset, otherwise, don't write it. Useful to
         overwrite attributes (for example ``axes_manager``) only without having
         to write the whole dataset.
+    parallel_compression : bool, default=False
+        If True, the chunks of non-lazy data are compressed in a thread pool
+        and written directly to the file, instead of being compressed by the
+        HDF5 library in a single thread. Only supported for ``'gzip'`` and the
+        Blosc compressions, which require
+        `python-blosc <https://github.com/Blosc/python-blosc>`_; otherwise,
+        the data is compressed by the HDF5 library. Arrays smaller than 1 MiB
+        are always compressed by the HDF5 library. Lazy data is compressed in
+        the dask workers, and with the Blosc compressions, the compressed
+        chunks are written directly.
+    cloud_optimized : bool, default=False
+        If True, use the HDF5 "page" file space strategy with pages larger
+        than the chunks of the data, so that the metadata and each chunk can
+        be fetched with few requests, which is faster for files read from
+        object storage or over the network. When reading, the page buffer can
+        be enabled by passing ``page_buf_size`` to :py:func:`file_reader`.
+        Only used when a new file is created and, as the file size is
+        rounded to pages of at least 4 MiB, not suitable for small files.
+    direct_io : bool, default=False
+        If True, write the file with the HDF5 direct driver, which bypasses
+        the page cache of the operating system using ``O_DIRECT``. This can
+        increase the writing speed of large uncompressed datasets on fast
+        storage and avoid filling the memory with the page cache. The direct
+        driver is only available on some platforms and if HDF5 has been
+        compiled with it. Otherwise, a warning is logged and the default
+        driver is used.
+    chunk_cache_bytes : int or None, default=0
+        The size in bytes of the HDF5 chunk cache of the file. Because each
+        chunk is written once, the chunk cache is disabled by default to avoid
+        copying the chunks to the cache before writing them. If the file is
+        kept open (``close_file=False``) and the data is then accessed with
+        many partial chunk reads or writes, a larger value can be faster.
+        If None, the default size of HDF5 is used (1 MiB).
     **kwds
-        The keyword argument are passed to the
+        The keyword arguments of :external+h5py:class:`h5py.File`
+        (for example ``mode``, ``driver``, ``libver``, ``swmr``, ``locking``
+        or ``rdcc_nbytes``) are used when creating the file, the other keyword
+        arguments are passed to the
         :external+h5py:meth:`h5py.Group.require_dataset` function.
+        When a new file is created, it is written with the file format of
+        HDF5 1.10 (``libver=("v110", "latest")``), which has faster metadata
+        structures but can't be read with HDF5 < 1.10. Use
+        ``libver="earliest"`` to write files compatible with older versions.
+        If ``swmr=True``, the SWMR (single writer multiple reader) mode is
+        enabled after writing, so that the file can be read while it is kept
+        open with ``close_file=False``.
 
     Notes
     -----
@@ -161,9 +488,8 @@ def file_writer(
     if not isinstance(write_dataset, bool):
         raise ValueError("`write_dataset` argument has to be a boolean.")
 
-    if "shuffle" not in kwds:
-        # Use shuffle by default to improve compression
-        kwds["shuffle"] = True
+    file_kwds = {key: kwds.pop(key) for key in _FILE_KWARGS.intersection(kwds)}
+    kwds = _get_compression_kwds(compression, kwds)
 
     folder = signal["tmp_parameters"].get("original_folder", "")
     fname = signal["tmp_parameters"].get("original_filename", "")
@@ -181,22 +507,57 @@ def file_writer(
                 "signal."
             )
 
+    # h5py only accepts `swmr` when reading, the mode is enabled after writing
+    swmr = file_kwds.pop("swmr", False)
+    if f is not None and swmr and f.libver[0] in ("earliest", "v108"):
+        raise ValueError(
+            "`swmr=True` requires the file to be opened with the HDF5 1.10 "
+            "file format or later. To overwrite the file with a lazy signal, "
+            "use `libver=('v110', 'latest')` when loading the signal."
+        )
     if f is None:
         # with "write_dataset=False", we need mode='a', otherwise the dataset
         # will be flushed with using 'w' mode
-        mode = kwds.get("mode", "w" if write_dataset else "a")
+        mode = file_kwds.pop("mode", "w" if write_dataset else "a")
         if mode != "a" and not write_dataset:
             raise ValueError("`mode='a'` is required to use " "`write_dataset=False`.")
-        f = h5py.File(filename, mode=mode)
-
-    f.attrs["file_format"] = "HyperSpy"
-    f.attrs["file_format_version"] = version
+        if mode not in ("a", "r+") or swmr:
+            # The file format of HDF5 1.10 has faster metadata structures
+            # and is required for SWMR
+            file_kwds.setdefault("libver", ("v110", "latest"))
+        if mode not in ("a", "r+"):
+            # Don't index the links and attributes by creation order, even
+            # if enabled in the h5py configuration
+            file_kwds.setdefault("track_order", False)
+        if chunk_cache_bytes is not None:
+            file_kwds.setdefault("rdcc_nbytes", chunk_cache_bytes)
+        if cloud_optimized:
+            file_kwds.update(
+                fs_strategy="page",
+                fs_persist=True,
+                fs_threshold=1,
+                fs_page_size=_get_page_size(signal, chunks, HyperspyWriter.target_size),
+            )
+        if direct_io:
+            if "direct" in h5py.registered_drivers():
+                file_kwds.update(
+                    driver="direct",
+                    alignment=4096,
+                    block_size=4096,
+                    cbuf_size=16 * 2**20,
+                )
+            else:
+                _logger.warning(
+                    "The HDF5 direct driver is not available, the file is "
+                    "written using the default driver."
+                )
+        f = h5py.File(filename, mode=mode, **file_kwds)
+
+    f.attrs.update({"file_format": "HyperSpy", "file_format_version": version})
     exps = f.require_group("Experiments")
     title = signal["metadata"]["General"]["title"]
-    group_name = title if title else "__unnamed__"
     # / is a invalid character, see https://github.com/hyperspy/hyperspy/issues/942
-    if "/" in group_name:
-        group_name = group_name.replace("/", "-")
+    group_name = title.translate(_SLASH_TRANS) if title else "__unnamed__"
     expg = exps.require_group(group_name)
 
     writer = HyperspyWriter(
@@ -204,12 +565,15 @@ def file_writer(
         signal,
         expg,
         chunks=chunks,
-        compression=compression,
         write_dataset=write_dataset,
+        parallel_compression=parallel_compression,
         **kwds,
     )
     writer.write()
 
+    if swmr:
+        f.swmr_mode = True
+
     if close_file:
         f.close()
 
@@ -218,7 +582,6 @@ file_writer.__doc__ %= (
     FILENAME_DOC.replace("read", "write to"),
     SIGNAL_DOC,
     CHUNKS_DOC,
-    COMPRESSION_HDF5_DOC,
     COMPRESSION_HDF5_NOTES_DOC,
 )
 
@@ -20,20 +20,150 @@
 # https://www.biochem.mpg.de/doc_tom/TOM_Release_2008/IOfun/tom_mrcread.html
 # and https://ami.scripps.edu/software/mrctools/mrc_specification.php
 
+from functools import lru_cache
 import logging
 import importlib.util
-import xml.etree.ElementTree as ET
 from pathlib import Path
-from copy import deepcopy
 
+import numba
 import numpy as np
 from numpy.polynomial.polynomial import polyfit
 
+try:
+    # lxml is much faster to parse large files
+    from lxml import etree as ET
+
+    lxml_installed = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    lxml_installed = False
+
 from rsciio._docstrings import FILENAME_DOC, LAZY_UNSUPPORTED_DOC, RETURNS_DOC
 
 
 _logger = logging.getLogger(__name__)
 
+# Number of characters of data rows converted to an array at once
+_ROWS_TEXT_SIZE = 2**24
+
+# Smaller texts are parsed with np.fromstring, for which the compilation (or
+# loading from the cache) of the numba kernels would take longer than parsing
+_NUMBA_TEXT_SIZE = 2**16
+
+# Powers of ten exactly representable as float64
+_POW10 = np.array([float(10**i) for i in range(23)])
+
+
+@numba.njit(cache=True)
+def _is_space(c):
+    return c == 32 or 9 <= c <= 13
+
+
+@numba.njit(nogil=True, cache=True)
+def _count_values(buf, offsets):
+    """Count the whitespace separated values of each row of ``buf``."""
+    num_rows = offsets.size - 1
+    counts = np.zeros(num_rows, dtype=np.int64)
+    for i in range(num_rows):
+        count = 0
+        in_value = False
+        for j in range(offsets[i], offsets[i + 1]):
+            space = _is_space(buf[j])
+            if not space and not in_value:
+                count += 1
+            in_value = not space
+        counts[i] = count
+    return counts
+
+
+@numba.njit(nogil=True, cache=True)
+def _parse_values(buf, offsets, positions, out):
+    """
+    Parse the decimal numbers of each row of ``buf`` into ``out``, starting
+    at ``positions``. Only numbers with at most 15 significant digits and a
+    decimal exponent of at most 22 are parsed, which can be converted
+    exactly; return False if other values are found.
+    """
+    num_rows = offsets.size - 1
+    valid = np.ones(num_rows, dtype=np.bool_)
+    for i in range(num_rows):
+        k = positions[i]
+        j = offsets[i]
+        end = offsets[i + 1]
+        while j < end:
+            if _is_space(buf[j]):
+                j += 1
+                continue
+            negative = buf[j] == 45  # "-"
+            if negative or buf[j] == 43:  # "+"
+                j += 1
+            mantissa = 0
+            num_digits = 0
+            significant_digits = 0
+            exponent = 0
+            fraction = False
+            while j < end:
+                c = buf[j]
+                if 48 <= c <= 57:
+                    if significant_digits > 0 or c > 48:
+                        significant_digits += 1
+                    if significant_digits <= 15:
+                        mantissa = mantissa * 10 + (c - 48)
+                    if fraction:
+                        exponent -= 1
+                    num_digits += 1
+                elif c == 46 and not fraction:  # "."
+                    fraction = True
+                else:
+                    break
+                j += 1
+            if j < end and (buf[j] == 101 or buf[j] == 69):  # "e" or "E"
+                j += 1
+                exponent_negative = j < end and buf[j] == 45
+                if j < end and (buf[j] == 45 or buf[j] == 43):
+                    j += 1
+                exponent_value = 0
+                exponent_digits = 0
+                while j < end and 48 <= buf[j] <= 57:
+                    exponent_value = min(exponent_value * 10 + (buf[j] - 48), 1000)
+                    exponent_digits += 1
+                    j += 1
+                if exponent_digits == 0:
+                    valid[i] = False
+                    break
+                exponent += -exponent_value if exponent_negative else exponent_value
+            if (
+                num_digits == 0
+                or significant_digits > 15
+                or (j < end and not _is_space(buf[j]))
+            ):
+                valid[i] = False
+                break
+            if mantissa == 0:
+                value = 0.0
+            elif 0 <= exponent <= 22:
+                value = mantissa * _POW10[exponent]
+            elif -22 <= exponent < 0:
+                value = mantissa / _POW10[-exponent]
+            else:
+                valid[i] = False
+                break
+            out[k] = -value if negative else value
+            k += 1
+    return valid.all()
+
+
+@lru_cache(maxsize=None)
+def _lumispy_installed():
+    """Check once if lumispy is installed, without importing it."""
+    if importlib.util.find_spec("lumispy") is None:
+        _logger.warning(
+            "Cannot find package lumispy, using BaseSignal1D as signal class."
+        )
+        return False
+    return True  # pragma: no cover
+
 
 def _remove_none_from_dict(dict_in):
     for key, value in list(dict_in.items()):
@@ -46,7 +176,8 @@ def _remove_none_from_dict(dict_in):
 class JobinYvonXMLReader:
     """Class to read Jobin Yvon .xml-files.
 
-    The file is read using xml.etree.ElementTree.
+    The file is read using lxml when installed, otherwise with
+    xml.etree.ElementTree.
     Each element can have the following attributes: attrib, tag, text.
     Moreover, non-leaf-elements are iterable (iterate over child-nodes).
     In this specific format, the tags do not contain useful information.
@@ -61,6 +192,9 @@ class JobinYvonXMLReader:
     use_uniform_signal_axis: bool, default=False
         Decides whether to use uniform or non-uniform signal-axis.
 
+    dtype: numpy.dtype or None, default=None
+        Data type of the data. If None, ``float32`` is used.
+
     Attributes
     ----------
     data, metadata, original_metadata, axes
@@ -70,81 +204,247 @@ class JobinYvonXMLReader:
     parse_file, get_original_metadata, get_axes, get_data, map_metadata
     """
 
-    def __init__(self, file_path, use_uniform_signal_axis=False):
+    __slots__ = (
+        "_file_path",
+        "_use_uniform_signal_axis",
+        "_dtype",
+        "_data_blocks",
+        "_num_rows",
+        "_row_sizes",
+        "_metadata_root",
+        "_axis_root",
+        "_title",
+        "_measurement_type",
+        "_angle",
+        "_reverse_signal",
+        "_has_nav1",
+        "_has_nav2",
+        "_nav1_size",
+        "_nav2_size",
+        "axes",
+        "data",
+        "metadata",
+        "original_metadata",
+    )
+
+    _NUMERIC_KEYS = frozenset(
+        [
+            "Acq. time (s)",
+            "Accumulations",
+            "Delay time (s)",
+            "Binning",
+            "Detector temperature (°C)",
+            "Objective",
+            "Grating",
+            "ND Filter",
+            "Laser (nm)",
+            "Spectro (nm)",
+            "Hole",
+            "Laser Pol. (°)",
+            "Raman Pol. (°)",
+            "X (µm)",
+            "Y (µm)",
+            "Z (µm)",
+            "Full time(s)",
+            "rotation angle (rad)",
+            "Windows",
+        ]
+    )
+
+    _SECOND_VALUE_KEYS = frozenset(
+        [
+            "Objective",
+            "Grating",
+            "ND Filter",
+            "Laser (nm)",
+            "Spectro (nm)",
+        ]
+    )
+
+    _RENAMED_KEYS = {"Grating": "Grating (gr/mm)", "ND Filter": "ND Filter (%)"}
+
+    # name and units of the signal axis for the units exported by LabSpec,
+    # other units are identified from their suffix
+    _SIGNAL_AXIS_NAMES = {
+        "nm": ("Wavelength", "nm"),
+        "1/cm": ("Raman Shift", "1/cm"),
+        "1/cm abs": ("Wavenumber", "1/cm"),
+        "eV": ("Energy", "eV"),
+    }
+
+    # (path in Acquisition_instrument, key, key in experimental_setup)
+    _METADATA_MAPPING = (
+        (("Laser",), "wavelength", "Laser (nm)"),
+        (("Laser",), "objective_magnification", "Objective"),
+        (("Laser", "Filter"), "optical_density", "ND Filter (%)"),
+        (("Laser", "Polarizer"), "polarizer_type", "Laser. Pol."),
+        (("Laser", "Polarizer"), "angle", "Laser Pol. (°)"),
+        (("Spectrometer",), "central_wavelength", "Spectro (nm)"),
+        (("Spectrometer",), "model", "Instrument"),
+        (("Spectrometer", "Grating"), "groove_density", "Grating (gr/mm)"),
+        (("Spectrometer",), "entrance_slit_width", "Hole"),
+        (("Spectrometer",), "spectral_range", "Range"),
+        (("Spectrometer", "Polarizer"), "polarizer_type", "Raman. Pol."),
+        (("Spectrometer", "Polarizer"), "angle", "Raman Pol. (°)"),
+        (("Detector",), "model", "Detector"),
+        (("Detector",), "delay_time", "Delay time (s)"),
+        (("Detector",), "binning", "Binning"),
+        (("Detector",), "temperature", "Detector temperature (°C)"),
+        (("Detector",), "exposure_per_frame", "Acq. time (s)"),
+        (("Detector",), "frames", "Accumulations"),
+        (("Detector", "processing"), "autofocus", "Autofocus"),
+        (("Detector", "processing"), "swift", "SWIFT"),
+        (("Detector", "processing"), "auto_exposure", "AutoExposure"),
+        (("Detector", "processing"), "spike_filter", "Spike filter"),
+        (("Detector", "processing"), "de_noise", "DeNoise"),
+        (("Detector", "processing"), "ics_correction", "ICS correction"),
+        (("Detector", "processing"), "dark_correction", "Dark correction"),
+        (("Detector", "processing"), "inst_process", "Inst. Process"),
+    )
+
+    def __init__(self, file_path, use_uniform_signal_axis=False, dtype=None):
         self._file_path = file_path
         self._use_uniform_signal_axis = use_uniform_signal_axis
-
-        if importlib.util.find_spec("lumispy") is None:
-            self._lumispy_installed = False
-            _logger.warning(
-                "Cannot find package lumispy, using BaseSignal1D as signal class."
-            )
-        else:
-            self._lumispy_installed = True  # pragma: no cover
+        self._dtype = np.float32 if dtype is None else dtype
 
     @property
     def _signal_type(self):
-        if self._lumispy_installed:
+        if _lumispy_installed():
             return "Luminescence"  # pragma: no cover
         else:
             return ""
 
     @staticmethod
-    def _get_id(xml_element):
-        return xml_element.attrib["ID"]
+    def _children_by_id(xml_element):
+        """Return a dictionary of the child-nodes of ``xml_element`` by ID."""
+        # get doesn't create the attrib mapping of lxml elements
+        return {child.get("ID"): child for child in xml_element}
 
     @staticmethod
-    def _get_size(xml_element):
-        return int(xml_element.attrib["Size"])
+    def _rows_to_array(rows_text, dtype=np.float64):
+        """Convert the text of consecutive data rows to a 1D array.
+
+        The rows are parsed with numba, which releases the GIL, falling back
+        to ``np.fromstring`` for short texts and for numbers which can't be
+        parsed exactly.
+        """
+        text = " ".join(rows_text)
+        if len(text) < _NUMBA_TEXT_SIZE:
+            return np.fromstring(text, sep=" ").astype(dtype, copy=False)
+        try:
+            buf = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+        except UnicodeEncodeError:
+            return np.fromstring(text, sep=" ").astype(dtype, copy=False)
+        offsets = np.zeros(len(rows_text) + 1, dtype=np.int64)
+        np.cumsum([len(row) + 1 for row in rows_text], out=offsets[1:])
+        offsets[-1] = buf.size
+        counts = _count_values(buf, offsets)
+        positions = np.zeros_like(offsets)
+        np.cumsum(counts, out=positions[1:])
+        # parse directly into an array of the requested dtype
+        data = np.empty(positions[-1], dtype=dtype)
+        if not _parse_values(buf, offsets, positions, data):
+            data = np.fromstring(text, sep=" ").astype(dtype, copy=False)
+        return data
 
     def parse_file(self):
-        """First parse through file to extract data/metadata positions."""
-        tree = ET.parse(self._file_path)
-        root = tree.getroot()
+        """First parse through file to extract metadata positions and data.
 
-        lsx_tree_list = root.findall("LSX_Tree")
-        if len(lsx_tree_list) > 1:
+        The file is parsed incrementally and the text of the data rows is
+        released as soon as it has been converted to an array, to limit the
+        memory used for large maps. To avoid parsing each row separately, the
+        text of consecutive rows is converted to an array at once, in blocks
+        of about ``_ROWS_TEXT_SIZE`` characters.
+        """
+        if lxml_installed:
+            # allow long text nodes (>10 MB) and skip comments, which the
+            # parser of the standard library doesn't return; don't resolve
+            # external entities of the file, which is user-supplied
+            source = str(self._file_path)
+            parser_kwds = dict(
+                tag=("LSX_Matrix", "LSX_Row"),
+                huge_tree=True,
+                remove_comments=True,
+                resolve_entities=False,
+                no_network=True,
+            )
+        else:
+            source = self._file_path
+            parser_kwds = {}
+
+        self._data_blocks = []
+        self._num_rows = 0
+        # number of values of each row given by the "Size" attribute
+        self._row_sizes = set()
+        rows_text = []
+        rows_text_size = 0
+        num_lsx_matrix = 0
+        context = ET.iterparse(source, events=("start", "end"), **parser_kwds)
+        for event, element in context:
+            if element.tag == "LSX_Matrix" and event == "start":
+                num_lsx_matrix += 1
+            elif element.tag == "LSX_Row" and event == "end":
+                if num_lsx_matrix == 1:
+                    self._row_sizes.add(element.get("Size"))
+                    rows_text.append(element.text)
+                    rows_text_size += len(element.text)
+                    self._num_rows += 1
+                    if rows_text_size > _ROWS_TEXT_SIZE:
+                        self._data_blocks.append(
+                            self._rows_to_array(rows_text, self._dtype)
+                        )
+                        rows_text = []
+                        rows_text_size = 0
+                element.clear()
+                if lxml_installed:
+                    # also remove the rows already read from the tree
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+        if rows_text:
+            self._data_blocks.append(self._rows_to_array(rows_text, self._dtype))
+        root = context.root
+
+        if num_lsx_matrix > 1:
             _logger.critical(
-                "File contains multiple positions to read metadata from.\n"
+                "File contains multiple positions to read data from.\n"
                 "The first location is choosen."
             )  # pragma: no cover
-        elif len(lsx_tree_list) == 0:
-            _logger.critical("No metadata found.")  # pragma: no cover
-        lsx_tree = lsx_tree_list[0]
+        elif num_lsx_matrix == 0:
+            _logger.critical("No data found.")  # pragma: no cover
 
-        lsx_matrix_list = root.findall("LSX_Matrix")
-        if len(lsx_matrix_list) > 1:
+        lsx_trees = root.iterfind("LSX_Tree")
+        lsx_tree = next(lsx_trees, None)
+        if lsx_tree is None:
+            _logger.critical("No metadata found.")  # pragma: no cover
+            return
+        if next(lsx_trees, None) is not None:
             _logger.critical(
-                "File contains multiple positions to read data from.\n"
+                "File contains multiple positions to read metadata from.\n"
                 "The first location is choosen."
             )  # pragma: no cover
-        elif len(lsx_matrix_list) == 0:
-            _logger.critical("No data found.")  # pragma: no cover
-        self._lsx_matrix = lsx_matrix_list[0]
-
-        for child in lsx_tree:
-            id = self._get_id(child)
-            if id == "0x6C62D4D9":
-                self._metadata_root = child
-            if id == "0x6C7469D9":
-                self._title = child.text
-            if id == "0x6D707974":
-                self._measurement_type = child.text
-            if id == "0x6C676EC6":
-                for child2 in child:
-                    if self._get_id(child2) == "0x0":
-                        self._angle = child2.text
-            if id == "0x7A74D9D6":
-                for child2 in child:
-                    if self._get_id(child2) == "0x7B697861":
-                        self._axis_root = child2
+
+        children = self._children_by_id(lsx_tree)
+        if "0x6C62D4D9" in children:
+            self._metadata_root = children["0x6C62D4D9"]
+        if "0x6C7469D9" in children:
+            self._title = children["0x6C7469D9"].text
+        if "0x6D707974" in children:
+            self._measurement_type = children["0x6D707974"].text
+        if "0x6C676EC6" in children:
+            angle = self._children_by_id(children["0x6C676EC6"]).get("0x0")
+            if angle is not None:
+                self._angle = angle.text
+        if "0x7A74D9D6" in children:
+            axis_root = self._children_by_id(children["0x7A74D9D6"]).get("0x7B697861")
+            if axis_root is not None:
+                self._axis_root = axis_root
 
         if not hasattr(self, "_metadata_root"):
             _logger.critical("Could not extract metadata")  # pragma: no cover
         if not hasattr(self, "_axis_root"):
             _logger.critical("Could not extract axis")  # pragma: no cover
 
-    def _get_metadata_values(self, xml_element, tag):
+    def _get_metadata_values(self, xml_element, tag, second_value_keys=frozenset()):
         """Helper method to extract information from metadata xml-element.
 
         Parameters
@@ -153,6 +453,9 @@ class JobinYvonXMLReader:
             Head level metadata element.
         tag: Str
             Used as the corresponding key in the original_metadata dictionary.
+        second_value_keys: frozenset
+            Keys for which the second value is used when available.
+            The first value is used for all other keys.
 
         Examples
         --------
@@ -168,147 +471,69 @@ class JobinYvonXMLReader:
         ID="0x7D6C61DB" -> first value
         ID="0x8736F70" -> second value
 
-        Which value is used is decided in _clean_up_metadata (in this case the second value is used).
+        Which value is used is decided by second_value_keys (in this case the second value is used).
+        Entries without any value are stored as an empty dictionary.
         """
         metadata_xml_element = dict()
         for child in xml_element:
-            values = {}
-            for child2 in child:
-                if self._get_id(child2) == "0x6D6D616E":
-                    key = child2.text
-                if self._get_id(child2) == "0x7D6C61DB":
-                    values["1"] = child2.text
-                if self._get_id(child2) == "0x8736F70":
-                    values["2"] = child2.text
-            metadata_xml_element[key] = values
+            children = self._children_by_id(child)
+            if "0x6D6D616E" not in children:
+                continue  # pragma: no cover
+            key = children["0x6D6D616E"].text
+            first = children.get("0x7D6C61DB")
+            second = children.get("0x8736F70")
+            if second is not None and (key in second_value_keys or first is None):
+                value = second.text
+            elif first is not None:
+                value = first.text
+            else:
+                value = {}
+            metadata_xml_element[key] = value
         self.original_metadata[tag] = metadata_xml_element
 
     def _clean_up_metadata(self):
         """Cleans up original metadata to meet standardized format.
 
-        This means converting numbers from strings to floats,
-        deciding which value shall be used (when 2 values are extracted,
-        see _get_metadata_values() for more information).
+        This means converting numbers from strings to floats.
         Moreover, some names are slightly modified.
         """
-        convert_to_numeric = [
-            "Acq. time (s)",
-            "Accumulations",
-            "Delay time (s)",
-            "Binning",
-            "Detector temperature (°C)",
-            "Objective",
-            "Grating",
-            "ND Filter",
-            "Laser (nm)",
-            "Spectro (nm)",
-            "Hole",
-            "Laser Pol. (°)",
-            "Raman Pol. (°)",
-            "X (µm)",
-            "Y (µm)",
-            "Z (µm)",
-            "Full time(s)",
-            "rotation angle (rad)",
-            "Windows",
-        ]
-
-        change_to_second_value = [
-            "Objective",
-            "Grating",
-            "ND Filter",
-            "Laser (nm)",
-            "Spectro (nm)",
-        ]
-
-        ## use second extracted value
-        for key in change_to_second_value:
-            try:
-                self.original_metadata["experimental_setup"][
-                    key
-                ] = self.original_metadata["experimental_setup"][key]["2"]
-            except KeyError:
-                pass
-
-        ## use first extracted value
-        for key, value in self.original_metadata["experimental_setup"].items():
-            if isinstance(value, dict):
-                # only if there is an entry/value
-                if bool(value):
-                    self.original_metadata["experimental_setup"][
-                        key
-                    ] = self.original_metadata["experimental_setup"][key]["1"]
-
-        for key, value in self.original_metadata["date"].items():
-            if isinstance(value, dict):
-                if bool(value):
-                    self.original_metadata["date"][key] = self.original_metadata[
-                        "date"
-                    ][key]["1"]
-
-        for key, value in self.original_metadata["file_information"].items():
-            if isinstance(value, dict):
-                if bool(value):
-                    self.original_metadata["file_information"][
-                        key
-                    ] = self.original_metadata["file_information"][key]["1"]
-
+        experimental_setup = self.original_metadata["experimental_setup"]
         ## convert strings to float
-        for key in convert_to_numeric:
-            try:
-                self.original_metadata["experimental_setup"][key] = float(
-                    self.original_metadata["experimental_setup"][key]
-                )
-            except KeyError:
-                pass
-
-        ## move the unit from grating to the key name
-        try:
-            self.original_metadata["experimental_setup"][
-                "Grating (gr/mm)"
-            ] = self.original_metadata["experimental_setup"].pop("Grating")
-        except KeyError:  # pragma: no cover
-            pass  # pragma: no cover
+        for key in self._NUMERIC_KEYS.intersection(experimental_setup):
+            experimental_setup[key] = float(experimental_setup[key])
 
-        ## add percentage for filter key name
-        try:
-            self.original_metadata["experimental_setup"][
-                "ND Filter (%)"
-            ] = self.original_metadata["experimental_setup"].pop("ND Filter")
-        except KeyError:  # pragma: no cover
-            pass  # pragma: no cover
+        ## move the unit from grating to the key name and add percentage for
+        ## filter key name
+        for key, new_key in self._RENAMED_KEYS.items():
+            if key in experimental_setup:
+                experimental_setup[new_key] = experimental_setup.pop(key)
 
     def get_original_metadata(self):
         """Extracts metadata from file."""
         self.original_metadata = {}
-        for child in self._metadata_root:
-            id = self._get_id(child)
-            if id == "0x7CECDBD7":
-                date = child
-            if id == "0x8716361":
-                metadata = child
-            if id == "0x7C73E2D2":
-                file_specs = child
+        children = self._children_by_id(self._metadata_root)
+        date = children["0x7CECDBD7"]
+        metadata = children["0x8716361"]
+        file_specs = children["0x7C73E2D2"]
 
         ## setup tree structure original_metadata -> date{...}, experimental_setup{...}, file_information{...}
         ## based on structure in file
         self._get_metadata_values(date, "date")
-        self._get_metadata_values(metadata, "experimental_setup")
+        self._get_metadata_values(
+            metadata, "experimental_setup", self._SECOND_VALUE_KEYS
+        )
         self._get_metadata_values(file_specs, "file_information")
+        experimental_setup = self.original_metadata["experimental_setup"]
         try:
-            self.original_metadata["experimental_setup"][
-                "measurement_type"
-            ] = self._measurement_type
+            experimental_setup["measurement_type"] = self._measurement_type
         except AttributeError:  # pragma: no cover
             pass  # pragma: no cover
         try:
-            self.original_metadata["experimental_setup"]["title"] = self._title
+            experimental_setup["title"] = self._title
         except AttributeError:  # pragma: no cover
             pass  # pragma: no cover
         try:
-            self.original_metadata["experimental_setup"][
-                "rotation angle (rad)"
-            ] = self._angle
+            experimental_setup["rotation angle (rad)"] = self._angle
         except AttributeError:
             pass
         self._clean_up_metadata()
@@ -323,15 +548,13 @@ class JobinYvonXMLReader:
         xml_element: xml.etree.ElementTree.Element
             Head level metadata element.
         """
-        for child in xml_element:
-            id = self._get_id(child)
-            ## contains also intensity-minima/maxima-values for each data-row (ignored by this reader)
-            if id == "0x6D707974":
-                self.original_metadata["experimental_setup"]["signal type"] = child.text
-            if id == "0x7C696E75":
-                self.original_metadata["experimental_setup"][
-                    "signal units"
-                ] = child.text
+        children = self._children_by_id(xml_element)
+        experimental_setup = self.original_metadata["experimental_setup"]
+        ## contains also intensity-minima/maxima-values for each data-row (ignored by this reader)
+        if "0x6D707974" in children:
+            experimental_setup["signal type"] = children["0x6D707974"].text
+        if "0x7C696E75" in children:
+            experimental_setup["signal units"] = children["0x7C696E75"].text
 
     def _set_nav_axis(self, xml_element, tag):
         """Helper method for setting navigation axes.
@@ -345,22 +568,21 @@ class JobinYvonXMLReader:
         """
         has_nav = True
         nav_dict = dict()
-        for child in xml_element:
-            id = self._get_id(child)
-            if id == "0x6D707974":
-                nav_dict["name"] = child.text
-            if id == "0x7C696E75":
-                nav_dict["units"] = child.text
-            if id == "0x7D6CD4DB":
-                nav_array = np.fromstring(child.text.strip(), sep=" ")
-                nav_size = nav_array.size
-                if nav_size < 2:
-                    has_nav = False
-                else:
-                    nav_dict["scale"] = nav_array[1] - nav_array[0]
-                    nav_dict["offset"] = nav_array[0]
-                    nav_dict["size"] = nav_size
-                    nav_dict["navigate"] = True
+        children = self._children_by_id(xml_element)
+        if "0x6D707974" in children:
+            nav_dict["name"] = children["0x6D707974"].text
+        if "0x7C696E75" in children:
+            nav_dict["units"] = children["0x7C696E75"].text
+        if "0x7D6CD4DB" in children:
+            nav_array = self._rows_to_array([children["0x7D6CD4DB"].text])
+            nav_size = nav_array.size
+            if nav_size < 2:
+                has_nav = False
+            else:
+                nav_dict["scale"] = nav_array[1] - nav_array[0]
+                nav_dict["offset"] = nav_array[0]
+                nav_dict["size"] = nav_size
+                nav_dict["navigate"] = True
         if has_nav:
             self.axes[tag] = nav_dict
         return has_nav, nav_size
@@ -377,62 +599,73 @@ class JobinYvonXMLReader:
         """
         signal_dict = dict()
         signal_dict["navigate"] = False
-        for child in xml_element:
-            id = self._get_id(child)
-            if id == "0x7D6CD4DB":
-                signal_array = np.fromstring(child.text.strip(), sep=" ")
-                if signal_array.size > 1:
-                    if signal_array[0] > signal_array[1]:
-                        signal_array = signal_array[::-1]
-                        self._reverse_signal = True
-                    else:
-                        self._reverse_signal = False
-                    if self._use_uniform_signal_axis:
-                        offset, scale = polyfit(
-                            np.arange(signal_array.size), signal_array, deg=1
-                        )
-                        signal_dict["offset"] = offset
-                        signal_dict["scale"] = scale
-                        signal_dict["size"] = signal_array.size
-                        scale_compare = 100 * np.max(
-                            np.abs(np.diff(signal_array) - scale) / scale
+        children = self._children_by_id(xml_element)
+        if "0x7D6CD4DB" in children:
+            child = children["0x7D6CD4DB"]
+            signal_array = self._rows_to_array([child.text])
+            if signal_array.size > 1:
+                # use the endpoints, which are less sensitive to local
+                # irregularities of the axis than the first two values
+                if signal_array[0] > signal_array[-1]:
+                    signal_array = signal_array[::-1]
+                    self._reverse_signal = True
+                else:
+                    self._reverse_signal = False
+                if self._use_uniform_signal_axis:
+                    offset, scale = polyfit(
+                        np.arange(signal_array.size), signal_array, deg=1
+                    )
+                    signal_dict["offset"] = offset
+                    signal_dict["scale"] = scale
+                    signal_dict["size"] = signal_array.size
+                    # the largest deviation from the scale is at the
+                    # extrema of the differences
+                    diff = np.diff(signal_array)
+                    scale_compare = (
+                        100
+                        * max(abs(diff.max() - scale), abs(diff.min() - scale))
+                        / scale
+                    )
+                    if scale_compare > 1:
+                        _logger.warning(
+                            f"The relative variation of the signal-axis-scale ({scale_compare:.2f}%) exceeds 1%.\n"
+                            "                              "
+                            "Using a non-uniform-axis is recommended."
                         )
-                        if scale_compare > 1:
-                            _logger.warning(
-                                f"The relative variation of the signal-axis-scale ({scale_compare:.2f}%) exceeds 1%.\n"
-                                "                              "
-                                "Using a non-uniform-axis is recommended."
-                            )
-                    else:
-                        signal_dict["axis"] = signal_array
-                else:  # pragma: no cover
-                    if self._use_uniform_signal_axis:  # pragma: no cover
-                        _logger.warning(  # pragma: no cover
-                            "Signal only contains one entry.\n"  # pragma: no cover
-                            "                              "  # pragma: no cover
-                            "Using non-uniform-axis independent of use_uniform_signal_axis setting"  # pragma: no cover
-                        )  # pragma: no cover
-                    signal_dict["axis"] = signal_array  # pragma: no cover
-            if id == "0x7C696E75":
-                units = child.text
-                if "/" in units and units[-3:] == "abs":
-                    signal_dict["name"] = "Wavenumber"
-                    signal_dict["units"] = units[:-4]
-                elif "/" in units and units[-1] == "m":
-                    signal_dict["name"] = "Raman Shift"
-                    signal_dict["units"] = units
-                elif units[-2:] == "eV":
-                    signal_dict["name"] = "Energy"
-                    signal_dict["units"] = units
-                elif "/" not in units and units[-1] == "m":
-                    signal_dict["name"] = "Wavelength"
-                    signal_dict["units"] = units
                 else:
-                    _logger.warning(
-                        "Cannot extract type of signal axis from units, using wavelength as name."
+                    signal_dict["axis"] = signal_array
+            else:  # pragma: no cover
+                if self._use_uniform_signal_axis:  # pragma: no cover
+                    _logger.warning(  # pragma: no cover
+                        "Signal only contains one entry.\n"  # pragma: no cover
+                        "                              "  # pragma: no cover
+                        "Using non-uniform-axis independent of use_uniform_signal_axis setting"  # pragma: no cover
                     )  # pragma: no cover
-                    signal_dict["name"] = "Wavelength"  # pragma: no cover
-                    signal_dict["units"] = units  # pragma: no cover
+                signal_dict["axis"] = signal_array  # pragma: no cover
+        if "0x7C696E75" in children:
+            units = children["0x7C696E75"].text
+            if units in self._SIGNAL_AXIS_NAMES:
+                signal_dict["name"], signal_dict["units"] = self._SIGNAL_AXIS_NAMES[
+                    units
+                ]
+            elif "/" in units and units[-3:] == "abs":
+                signal_dict["name"] = "Wavenumber"
+                signal_dict["units"] = units[:-4]
+            elif "/" in units and units[-1] == "m":
+                signal_dict["name"] = "Raman Shift"
+                signal_dict["units"] = units
+            elif units[-2:] == "eV":
+                signal_dict["name"] = "Energy"
+                signal_dict["units"] = units
+            elif "/" not in units and units[-1] == "m":
+                signal_dict["name"] = "Wavelength"
+                signal_dict["units"] = units
+            else:
+                _logger.warning(
+                    "Cannot extract type of signal axis from units, using wavelength as name."
+                )  # pragma: no cover
+                signal_dict["name"] = "Wavelength"  # pragma: no cover
+                signal_dict["units"] = units  # pragma: no cover
         self.axes["signal_dict"] = signal_dict
 
     def _sort_nav_axes(self):
@@ -453,39 +686,64 @@ class JobinYvonXMLReader:
         self.axes = dict()
         self._has_nav1 = False
         self._has_nav2 = False
-        for child in self._axis_root:
-            if self._get_id(child) == "0x0":
-                self._set_signal_type(child)
-            if self._get_id(child) == "0x1":
-                self._set_signal_axis(child)
-            if self._get_id(child) == "0x2":
-                self._has_nav1, self._nav1_size = self._set_nav_axis(child, "nav1_dict")
-            if self._get_id(child) == "0x3":
-                self._has_nav2, self._nav2_size = self._set_nav_axis(child, "nav2_dict")
+        children = self._children_by_id(self._axis_root)
+        if "0x0" in children:
+            self._set_signal_type(children["0x0"])
+        if "0x1" in children:
+            self._set_signal_axis(children["0x1"])
+        if "0x2" in children:
+            self._has_nav1, self._nav1_size = self._set_nav_axis(
+                children["0x2"], "nav1_dict"
+            )
+        if "0x3" in children:
+            self._has_nav2, self._nav2_size = self._set_nav_axis(
+                children["0x3"], "nav2_dict"
+            )
 
         self._sort_nav_axes()
 
+    def _check_row_sizes(self):
+        """Check that the data rows have the same number of values, as given
+        by their "Size" attribute, and that all values have been read."""
+        if len(self._row_sizes) > 1:
+            raise ValueError(
+                "The data rows of the file have different sizes "
+                f"({', '.join(sorted(str(size) for size in self._row_sizes))}), "
+                "which is not supported."
+            )
+        (row_size,) = self._row_sizes
+        if row_size is None:
+            return
+        num_values = sum(block.size for block in self._data_blocks)
+        if num_values != int(row_size) * self._num_rows:
+            raise ValueError(
+                f"The file contains {self._num_rows} data rows of {row_size} "
+                f"values, but {num_values} values were read."
+            )
+
     def get_data(self):
         """Extract data from file."""
-        data_raw = self._lsx_matrix.findall("LSX_Row")
         ## lexicographical ordering -> 3x3 map -> 9 rows
-        num_rows = len(data_raw)
+        num_rows = self._num_rows
+        if num_rows > 0:
+            self._check_row_sizes()
         if num_rows == 0:
             _logger.critical("No data found.")  # pragma: no cover
         elif num_rows == 1:
             ## Spectrum
-            self.data = np.fromstring(data_raw[0].text.strip(), sep=" ")
+            self.data = self._data_blocks[0]
             if self._reverse_signal:
                 self.data = self.data[::-1]
         else:
             ## linescan or map
-            num_cols = self._get_size(data_raw[0])
-            self.data = np.empty((num_rows, num_cols))
-            for i, row in enumerate(data_raw):
-                row_array = np.fromstring(row.text.strip(), sep=" ")
-                if self._reverse_signal:
-                    row_array = row_array[::-1]
-                self.data[i, :] = row_array
+            if len(self._data_blocks) == 1:
+                self.data = self._data_blocks[0]
+            else:
+                self.data = np.concatenate(self._data_blocks)
+            self.data = self.data.reshape(num_rows, -1)
+            num_cols = self.data.shape[1]
+            if self._reverse_signal:
+                self.data = self.data[:, ::-1]
             ## reshape the array (lexicographic -> cartesian)
             ## reshape depends on available axes
             if self._has_nav2:
@@ -509,14 +767,23 @@ class JobinYvonXMLReader:
         detector = {"processing": {}}
         spectral_image = {}
         sample = {}
+        acquisition_instrument = {
+            "Laser": laser,
+            "Spectrometer": spectrometer,
+            "Detector": detector,
+            "Spectral_image": spectral_image,
+        }
 
-        sample["description"] = self.original_metadata["file_information"].get("Sample")
+        experimental_setup = self.original_metadata["experimental_setup"]
+        file_information = self.original_metadata["file_information"]
+
+        sample["description"] = file_information.get("Sample")
 
         general["title"] = self._title
         general["original_filename"] = self._file_path.name
-        general["notes"] = self.original_metadata["file_information"].get("Remark")
+        general["notes"] = file_information.get("Remark")
         try:
-            date, time = self.original_metadata["date"]["Acquired"].split(" ")
+            date, _, time = self.original_metadata["date"]["Acquired"].partition(" ")
         except KeyError:  # pragma: no cover
             pass  # pragma: no cover
         else:
@@ -526,10 +793,8 @@ class JobinYvonXMLReader:
         signal["signal_type"] = self._signal_type
         signal["signal_dimension"] = 1
         try:
-            intensity_axis = self.original_metadata["experimental_setup"]["signal type"]
-            intensity_units = self.original_metadata["experimental_setup"][
-                "signal units"
-            ]
+            intensity_axis = experimental_setup["signal type"]
+            intensity_units = experimental_setup["signal units"]
         except KeyError:  # pragma: no cover
             pass  # pragma: no cover
         else:
@@ -541,141 +806,56 @@ class JobinYvonXMLReader:
                 intensity_units = "Counts"
             signal["quantity"] = f"{intensity_axis} ({intensity_units})"
 
-        laser["wavelength"] = self.original_metadata["experimental_setup"].get(
-            "Laser (nm)"
-        )
-        laser["objective_magnification"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Objective")
-        laser["Filter"]["optical_density"] = self.original_metadata[
-            "experimental_setup"
-        ].get("ND Filter (%)")
-        laser["Polarizer"]["polarizer_type"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Laser. Pol.")
-        laser["Polarizer"]["angle"] = self.original_metadata["experimental_setup"].get(
-            "Laser Pol. (°)"
-        )
-
-        spectrometer["central_wavelength"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Spectro (nm)")
-        spectrometer["model"] = self.original_metadata["experimental_setup"].get(
-            "Instrument"
-        )
-        spectrometer["Grating"]["groove_density"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Grating (gr/mm)")
-        spectrometer["entrance_slit_width"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Hole")
-        spectrometer["spectral_range"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Range")
-        spectrometer["Polarizer"]["polarizer_type"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Raman. Pol.")
-        spectrometer["Polarizer"]["angle"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Raman Pol. (°)")
-
-        detector["model"] = self.original_metadata["experimental_setup"].get("Detector")
-        detector["delay_time"] = self.original_metadata["experimental_setup"].get(
-            "Delay time (s)"
-        )
-        detector["binning"] = self.original_metadata["experimental_setup"].get(
-            "Binning"
-        )
-        detector["temperature"] = self.original_metadata["experimental_setup"].get(
-            "Detector temperature (°C)"
-        )
-        detector["exposure_per_frame"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Acq. time (s)")
-        detector["frames"] = self.original_metadata["experimental_setup"].get(
-            "Accumulations"
-        )
-        detector["processing"]["autofocus"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Autofocus")
-        detector["processing"]["swift"] = self.original_metadata[
-            "experimental_setup"
-        ].get("SWIFT")
-        detector["processing"]["auto_exposure"] = self.original_metadata[
-            "experimental_setup"
-        ].get("AutoExposure")
-        detector["processing"]["spike_filter"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Spike filter")
-        detector["processing"]["de_noise"] = self.original_metadata[
-            "experimental_setup"
-        ].get("DeNoise")
-        detector["processing"]["ics_correction"] = self.original_metadata[
-            "experimental_setup"
-        ].get("ICS correction")
-        detector["processing"]["dark_correction"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Dark correction")
-        detector["processing"]["inst_process"] = self.original_metadata[
-            "experimental_setup"
-        ].get("Inst. Process")
+        for path, key, original_key in self._METADATA_MAPPING:
+            if original_key in experimental_setup:
+                node = acquisition_instrument
+                for name in path:
+                    node = node[name]
+                node[key] = experimental_setup[original_key]
 
         ## extra units here, because rad vs. deg
-        if "rotation angle (rad)" in self.original_metadata["experimental_setup"]:
-            spectral_image["rotation_angle"] = self.original_metadata[
-                "experimental_setup"
-            ]["rotation angle (rad)"] * (180 / np.pi)
+        if "rotation angle (rad)" in experimental_setup:
+            spectral_image["rotation_angle"] = experimental_setup[
+                "rotation angle (rad)"
+            ] * (180 / np.pi)
             spectral_image["rotation_angle_units"] = "°"
 
         ## settings for glued spectra
-        if "Windows" in self.original_metadata["experimental_setup"]:
+        if "Windows" in experimental_setup:
             detector["glued_spectrum"] = True
-            detector["glued_spectrum_windows"] = self.original_metadata[
-                "experimental_setup"
-            ]["Windows"]
+            detector["glued_spectrum_windows"] = experimental_setup["Windows"]
         else:
             detector["glued_spectrum"] = False
 
         ## calculate and set integration time
-        try:
-            integration_time = (
-                self.original_metadata["experimental_setup"]["Accumulations"]
-                * self.original_metadata["experimental_setup"]["Acq. time (s)"]
+        if "Accumulations" in experimental_setup and "Acq. time (s)" in (
+            experimental_setup
+        ):
+            detector["integration_time"] = (
+                experimental_setup["Accumulations"]
+                * experimental_setup["Acq. time (s)"]
             )
-        except KeyError:  # pragma: no cover
-            pass  # pragma: no cover
-        else:
-            detector["integration_time"] = integration_time
 
         ## convert filter range from percentage (0-100) to (0-1)
-        try:
+        if "optical_density" in laser["Filter"]:
             laser["Filter"]["optical_density"] /= 100
-        except KeyError:  # pragma: no cover
-            pass  # pragma: no cover
 
         ## convert entrance_hole_width to mm
-        try:
+        if "entrance_slit_width" in spectrometer:
             spectrometer["entrance_slit_width"] /= 100
             spectrometer["pinhole"] = spectrometer["entrance_slit_width"]
-        except KeyError:  # pragma: no cover
-            pass  # pragma: no cover
 
         self.metadata = {
             "General": general,
             "Signal": signal,
             "Sample": sample,
-            "Acquisition_instrument": {
-                "Laser": laser,
-                "Spectrometer": spectrometer,
-                "Detector": detector,
-                "Spectral_image": spectral_image,
-            },
+            "Acquisition_instrument": acquisition_instrument,
         }
 
         _remove_none_from_dict(self.metadata)
 
 
-def file_reader(filename, lazy=False, use_uniform_signal_axis=False):
+def file_reader(filename, lazy=False, use_uniform_signal_axis=False, dtype=None):
     """
     Read data from .xml files saved using Horiba Jobin Yvon's LabSpec software.
 
@@ -688,6 +868,10 @@ def file_reader(filename, lazy=False, use_uniform_signal_axis=False):
         If ``True``, the ``scale`` attribute is calculated from the average delta
         along the signal axis and a warning is raised in case the delta varies
         by more than 1 percent.
+    dtype : str, numpy.dtype or None, default=None
+        The data type of the data. If None, ``float32`` is used. The values
+        are written with at most about 7 significant digits in the file, which
+        ``float32`` represents accurately with half the memory of ``float64``.
 
     %s
     """
@@ -696,7 +880,9 @@ def file_reader(filename, lazy=False, use_uniform_signal_axis=False):
     if not isinstance(filename, Path):
         filename = Path(filename)
     jy = JobinYvonXMLReader(
-        file_path=filename, use_uniform_signal_axis=use_uniform_signal_axis
+        file_path=filename,
+        use_uniform_signal_axis=use_uniform_signal_axis,
+        dtype=dtype,
     )
     jy.parse_file()
     jy.get_original_metadata()
@@ -706,8 +892,8 @@ def file_reader(filename, lazy=False, use_uniform_signal_axis=False):
     dictionary = {
         "data": jy.data,
         "axes": jy.axes,
-        "metadata": deepcopy(jy.metadata),
-        "original_metadata": deepcopy(jy.original_metadata),
+        "metadata": jy.metadata,
+        "original_metadata": jy.original_metadata,
     }
     return [
         dictionary,
@@ -16,6 +16,7 @@
 # You should have received a copy of the GNU General Public License
 # along with RosettaSciIO. If not, see <https://www.gnu.org/licenses/#GPL>.
 
+import inspect
 import logging
 from pathlib import Path
 import sys
@@ -495,7 +496,7 @@ def test_lazy_loading(tmp_path):
 def test_passing_compression_opts_saving(tmp_path):
     filename = tmp_path / "testfile.hdf5"
     hs.signals.BaseSignal([1, 2, 3]).save(
-        filename, compression_opts=8, file_format="HSPY"
+        filename, compression="gzip", compression_opts=8, file_format="HSPY"
     )
 
     f = h5py.File(filename, mode="r+")
@@ -813,6 +814,188 @@ def test_compression(compression, tmp_path):
     _ = hs.load(tmp_path / "test_compression.hspy")
 
 
+def test_default_compression(tmp_path):
+    fname = tmp_path / "test_compression.hspy"
+    hs.signals.Signal1D(np.ones((3, 3))).save(fname)
+    with h5py.File(fname, mode="r") as f:
+        d = f["Experiments/__unnamed__/data"]
+        assert d.compression == "lzf"
+        assert not d.shuffle
+
+
+@pytest.mark.parametrize("compression", ("gzip", "lzf"))
+def test_compression_shuffle(compression, tmp_path):
+    fname = tmp_path / "test_compression.hspy"
+    hs.signals.Signal1D(np.ones((3, 3))).save(fname, compression=compression)
+    with h5py.File(fname, mode="r") as f:
+        # shuffle is only enabled by default for gzip
+        assert f["Experiments/__unnamed__/data"].shuffle == (compression == "gzip")
+
+
+def test_compression_opts_lzf(tmp_path, caplog):
+    fname = tmp_path / "test_compression.hspy"
+    s = hs.signals.Signal1D(np.ones((3, 3)))
+    with caplog.at_level(logging.WARNING):
+        s.save(fname, compression="lzf", compression_opts=4)
+    assert "`compression_opts` is ignored" in caplog.text
+    np.testing.assert_allclose(hs.load(fname).data, s.data)
+
+
+@pytest.mark.parametrize(
+    "compression", ("blosc", "blosc:lz4", "blosc:zstd", "blosc2", "blosc2:lz4")
+)
+def test_compression_blosc(compression, tmp_path):
+    hdf5plugin = pytest.importorskip("hdf5plugin")
+    fname = tmp_path / "test_compression.hspy"
+    s = hs.signals.Signal1D(np.arange(100, dtype="float32").reshape((10, 10)))
+    s.save(fname, compression=compression)
+    with h5py.File(fname, mode="r") as f:
+        d = f["Experiments/__unnamed__/data"]
+        dcpl = d.id.get_create_plist()
+        assert dcpl.get_nfilters() == 1
+        if compression.startswith("blosc2"):
+            filter_id = hdf5plugin.BLOSC2_ID
+        else:
+            filter_id = hdf5plugin.BLOSC_ID
+        assert dcpl.get_filter(0)[0] == filter_id
+    np.testing.assert_allclose(hs.load(fname).data, s.data)
+
+
+@pytest.mark.parametrize("compression", ("blosc:lz4", "blosc:zstd"))
+def test_save_lazy_blosc_direct_chunk_write(tmp_path, compression):
+    pytest.importorskip("hdf5plugin")
+    pytest.importorskip("blosc")
+    from rsciio.hspy._api import _get_chunk_encoder
+
+    data = da.arange(10 * 13 * 20, dtype="float32").reshape((10, 13, 20))
+    s = hs.signals.Signal1D(data.rechunk((4, 5, 20))).as_lazy()
+    fname = tmp_path / "test.hspy"
+    s.save(fname, compression=compression)
+    with h5py.File(fname, mode="r") as f:
+        dset = f["Experiments/__unnamed__/data"]
+        assert dset.chunks == (4, 5, 20)
+        assert _get_chunk_encoder(dset) is not None
+    s2 = hs.load(fname)
+    np.testing.assert_allclose(s2.data, data.compute())
+
+
+@pytest.mark.parametrize("compression", ("gzip", None))
+def test_save_lazy_aligned_chunks(tmp_path, compression):
+    from rsciio.hspy._api import _chunks_aligned
+
+    assert _chunks_aligned(((8, 5), (13,), (20,)), (4, 5, 20))
+    assert not _chunks_aligned(((2, 2, 9), (13,), (20,)), (4, 5, 20))
+    data = da.arange(13 * 13 * 20, dtype="float32").reshape((13, 13, 20))
+    # dask blocks made of several HDF5 chunks, including edge chunks
+    s = hs.signals.Signal1D(data.rechunk((8, 10, 20))).as_lazy()
+    fname = tmp_path / "test.hspy"
+    s.save(fname, chunks=(4, 5, 20), compression=compression)
+    with h5py.File(fname, mode="r") as f:
+        assert f["Experiments/__unnamed__/data"].chunks == (4, 5, 20)
+    np.testing.assert_allclose(hs.load(fname).data, data.compute())
+
+
+@pytest.mark.parametrize("lazy", (True, False))
+@pytest.mark.parametrize("compression", ("gzip", "lzf", "blosc:zstd"))
+def test_save_parallel_compression(tmp_path, compression, lazy, monkeypatch):
+    from rsciio.hspy import _api
+
+    # also use the thread pool for small arrays
+    monkeypatch.setattr(_api, "_PARALLEL_COMPRESSION_SIZE", 0)
+    if compression.startswith("blosc"):
+        pytest.importorskip("hdf5plugin")
+        pytest.importorskip("blosc")
+    data = np.arange(10 * 13 * 20, dtype="int16").reshape((10, 13, 20))
+    s = hs.signals.Signal1D(data)
+    if lazy:
+        s = s.as_lazy()
+    fname = tmp_path / "test.hspy"
+    s.save(fname, chunks=(4, 5, 20), compression=compression, parallel_compression=True)
+    with h5py.File(fname, mode="r") as f:
+        assert f["Experiments/__unnamed__/data"].chunks == (4, 5, 20)
+    np.testing.assert_allclose(hs.load(fname).data, data)
+
+
+@pytest.mark.parametrize("lazy", (True, False))
+def test_save_cloud_optimized(tmp_path, lazy):
+    s = hs.signals.Signal1D(np.arange(20 * 1000 * 1024, dtype="int8").reshape(20, -1))
+    if lazy:
+        s = s.as_lazy()
+        s.data = s.data.rechunk((20, -1))
+        page_size = 2**25
+    else:
+        # 9 signals per chunk
+        page_size = 2**24
+    fname = tmp_path / "test.hspy"
+    s.save(fname, cloud_optimized=True)
+    with h5py.File(fname, mode="r") as f:
+        fcpl = f.id.get_create_plist()
+        assert fcpl.get_file_space_strategy()[0] == h5py.h5f.FSPACE_STRATEGY_PAGE
+        assert fcpl.get_file_space_page_size() == page_size
+    s2 = hs.load(fname, page_buf_size=2 * page_size)
+    np.testing.assert_allclose(s2.data, s.data)
+
+
+@pytest.mark.parametrize("chunk_cache_bytes", (0, 2**24, None))
+def test_save_chunk_cache_bytes(tmp_path, monkeypatch, chunk_cache_bytes):
+    file_kwds = []
+    File = h5py.File
+
+    def _File(*args, **kwds):
+        file_kwds.append(kwds)
+        return File(*args, **kwds)
+
+    monkeypatch.setattr(h5py, "File", _File)
+    s = hs.signals.Signal1D(np.arange(100).reshape((10, 10)))
+    fname = tmp_path / "test.hspy"
+    s.save(fname, chunk_cache_bytes=chunk_cache_bytes)
+    if chunk_cache_bytes is None:
+        assert "rdcc_nbytes" not in file_kwds[0]
+    else:
+        assert file_kwds[0]["rdcc_nbytes"] == chunk_cache_bytes
+    monkeypatch.undo()
+    np.testing.assert_allclose(hs.load(fname).data, s.data)
+
+
+def test_save_direct_io(tmp_path, caplog):
+    s = hs.signals.Signal1D(np.arange(100).reshape((10, 10)))
+    fname = tmp_path / "test.hspy"
+    with caplog.at_level(logging.WARNING):
+        s.save(fname, compression=None, direct_io=True)
+    if "direct" not in h5py.registered_drivers():
+        assert "direct driver is not available" in caplog.text
+    np.testing.assert_allclose(hs.load(fname).data, s.data)
+
+
+def test_get_chunk_encoder_unsupported_filter(tmp_path):
+    from rsciio.hspy._api import _get_chunk_encoder
+
+    with h5py.File(tmp_path / "test.hdf5", mode="w") as f:
+        dset = f.create_dataset("lzf", shape=(10,), chunks=(5,), compression="lzf")
+        assert _get_chunk_encoder(dset) is None
+        dset = f.create_dataset(
+            "gzip", shape=(10,), chunks=(5,), compression="gzip", fletcher32=True
+        )
+        assert _get_chunk_encoder(dset) is None
+        dset = f.create_dataset("no_filter", shape=(10,), chunks=(5,))
+        assert _get_chunk_encoder(dset) is None
+        dset = f.create_dataset(
+            "gzip_shuffle", shape=(10,), chunks=(5,), compression="gzip", shuffle=True
+        )
+        assert _get_chunk_encoder(dset) is not None
+        # only Blosc is compressed outside of HDF5 for lazy data
+        assert _get_chunk_encoder(dset, blosc_only=True) is None
+
+
+def test_save_non_contiguous_data(tmp_path):
+    data = np.arange(6 * 7 * 8, dtype=float).reshape((6, 7, 8)).transpose((1, 0, 2))
+    assert not data.flags.c_contiguous
+    s = hs.signals.Signal1D(data)
+    fname = tmp_path / "test.hspy"
+    s.save(fname, chunks=(3, 2, 8))
+    np.testing.assert_allclose(hs.load(fname).data, data)
+
+
 def test_strings_from_py2():
     s = hs.datasets.example_signals.EDS_TEM_Spectrum()
     assert isinstance(s.metadata.Sample.elements, list)
@@ -847,6 +1030,35 @@ def test_save_ragged_dim2(tmp_path, file):
         np.testing.assert_array_equal(i, j)
 
 
+def test_save_ragged_array_several_chunks(tmp_path):
+    x = np.empty(5, dtype=object)
+    for i in range(5):
+        x[i] = np.arange(i + 1)
+    s = hs.signals.BaseSignal(x, ragged=True)
+    fname = tmp_path / "test.hspy"
+    s.save(fname, chunks=(2,))
+    s2 = hs.load(fname)
+    for i, j in zip(s.data, s2.data):
+        np.testing.assert_array_equal(i, j)
+
+
+def test_save_ragged_default_chunks(tmp_path):
+    data = np.empty(50, dtype=object)
+    for i in range(data.size):
+        data[i] = np.zeros(100000)
+    s = hs.signals.BaseSignal(data, ragged=True)
+    fname = tmp_path / "test.hspy"
+    s.save(fname)
+    with h5py.File(fname, mode="r") as f:
+        dset = f["Experiments/__unnamed__/data"]
+        assert dset.shape == data.shape
+        # 10 MB / 800 kB per array
+        assert dset.chunks == (12,)
+    s2 = hs.load(fname)
+    for i, j in zip(s.data, s2.data):
+        np.testing.assert_array_equal(i, j)
+
+
 def test_load_missing_extension(caplog):
     path = TEST_DATA_PATH / "hspy_ext_missing.hspy"
     with pytest.warns(UserWarning):
@@ -973,6 +1185,15 @@ def test_get_signal_chunks(target_size):
     assert (np.array(chunks) <= np.array(shape)).all()
 
 
+def test_default_chunks_target_size(tmp_path):
+    fname = tmp_path / "test.hspy"
+    hs.signals.Signal1D(np.zeros((100, 100, 256))).save(fname)
+    with h5py.File(fname, mode="r") as f:
+        chunks = f["Experiments/__unnamed__/data"].chunks
+    assert chunks == (69, 69, 256)
+    assert 1e6 < np.prod(chunks) * 8 <= 1e7
+
+
 def test_get_signal_chunks_big_signal():
     # One signal exceeds the target size
     shape = (10, 1000, 5, 1000)
@@ -1014,3 +1235,61 @@ def test_more_recent_version_warning(tmp_path):
     with pytest.warns(UserWarning):
         s2 = hs.load(filename)
     np.testing.assert_allclose(s.data, s2.data)
+
+
+def test_file_kwargs():
+    from rsciio.hspy._api import _FILE_KWARGS
+
+    parameters = inspect.signature(h5py.File.__init__).parameters
+    assert "name" not in _FILE_KWARGS
+    for key in ("mode", "libver", "swmr", "locking", "page_buf_size"):
+        assert (key in _FILE_KWARGS) == (key in parameters)
+
+
+def test_file_kwargs_meta_block_size(tmp_path):
+    if "meta_block_size" not in inspect.signature(h5py.File.__init__).parameters:
+        pytest.skip("`meta_block_size` is not supported by this version of h5py")
+    filename = tmp_path / "test.hspy"
+    s = hs.signals.Signal1D(np.arange(10))
+    s.save(filename, meta_block_size=4096)
+    s2 = hs.load(filename)
+    np.testing.assert_allclose(s.data, s2.data)
+
+
+def test_file_kwargs_not_passed_to_datasets(tmp_path):
+    filename = tmp_path / "test.hspy"
+    s = hs.signals.Signal1D(np.arange(10))
+    s.save(filename, libver="latest", track_order=True)
+
+    with h5py.File(filename, mode="r") as f:
+        # superblock version 3 is written with the 1.10 file format or later
+        assert f.id.get_create_plist().get_version()[0] == 3
+    s2 = hs.load(filename)
+    np.testing.assert_allclose(s.data, s2.data)
+
+
+def test_libver_swmr(tmp_path):
+    filename = tmp_path / "test.hspy"
+    s = hs.signals.Signal1D(np.arange(10))
+    s.save(filename)
+    with h5py.File(filename, mode="r") as f:
+        # superblock version 3 is written with the 1.10 file format
+        assert f.id.get_create_plist().get_version()[0] == 3
+
+    s.save(filename, overwrite=True, libver="earliest")
+    with h5py.File(filename, mode="r") as f:
+        assert f.id.get_create_plist().get_version()[0] == 0
+
+    s = s.as_lazy()
+    s.save(filename, overwrite=True)
+    s = hs.load(filename, lazy=True, mode="a")
+    with pytest.raises(ValueError, match="HDF5 1.10 file format"):
+        s.save(filename, overwrite=True, swmr=True, close_file=False)
+    s.close_file()
+
+    s = hs.load(filename, lazy=True, mode="a", libver=("v110", "latest"))
+    s.save(filename, overwrite=True, swmr=True, close_file=False)
+    assert get_file_handle(s.data).swmr_mode
+    with h5py.File(filename, mode="r", swmr=True) as f:
+        np.testing.assert_allclose(f["Experiments/__unnamed__/data"], np.arange(10))
+    s.close_file()
@@ -21,10 +21,10 @@
 # and https://ami.scripps.edu/software/mrctools/mrc_specification.php
 
 import gc
+import re
 import pytest
 import importlib.util
 from pathlib import Path
-from copy import deepcopy
 
 import numpy as np
 
@@ -239,10 +239,8 @@ class TestSpec:
             ]
         )
 
-        uniform_axis_manager = deepcopy(self.s.axes_manager.as_dictionary())
-        non_uniform_axis_manager = deepcopy(
-            self.s_non_uniform.axes_manager.as_dictionary()
-        )
+        uniform_axis_manager = self.s.axes_manager.as_dictionary()
+        non_uniform_axis_manager = self.s_non_uniform.axes_manager.as_dictionary()
         np.testing.assert_allclose(
             uniform_axis_manager["axis-0"].pop("scale"), 0.4481, atol=0.0001
         )
@@ -312,8 +310,8 @@ class TestSpec:
         )
 
     def test_metadata(self):
-        metadata = deepcopy(self.s.metadata.as_dictionary())
-        metadata_non_uniform = deepcopy(self.s_non_uniform.metadata.as_dictionary())
+        metadata = self.s.metadata.as_dictionary()
+        metadata_non_uniform = self.s_non_uniform.metadata.as_dictionary()
         assert (
             metadata_non_uniform["General"]["FileIO"]["0"]["io_plugin"]
             == "rsciio.jobinyvon"
@@ -571,9 +569,8 @@ class TestLinescan:
             757,
             781,
         ]
-        assert linescan_row0[::-1] == self.s.data.tolist()[0]
-        assert linescan_row1[::-1] == self.s.data.tolist()[1]
-        assert linescan_row2[::-1] == self.s.data.tolist()[2]
+        expected = np.array([linescan_row0, linescan_row1, linescan_row2])[:, ::-1]
+        np.testing.assert_array_equal(self.s.data, expected)
         np.testing.assert_allclose(self.s.data, self.s_non_uniform.data)
 
     def test_axes(self):
@@ -657,10 +654,8 @@ class TestLinescan:
             ]
         )
 
-        uniform_axis_manager = deepcopy(self.s.axes_manager.as_dictionary())
-        non_uniform_axis_manager = deepcopy(
-            self.s_non_uniform.axes_manager.as_dictionary()
-        )
+        uniform_axis_manager = self.s.axes_manager.as_dictionary()
+        non_uniform_axis_manager = self.s_non_uniform.axes_manager.as_dictionary()
 
         np.testing.assert_allclose(
             uniform_axis_manager["axis-1"].pop("scale"), 0.4481, atol=0.0001
@@ -931,12 +926,11 @@ class TestMap:
             108.5,
         ]
 
-        assert map_row0[::-1] == self.s.inav[0, 0].data.tolist()
-        assert map_row1[::-1] == self.s.inav[1, 0].data.tolist()
-        assert map_row2[::-1] == self.s.inav[2, 0].data.tolist()
-        assert map_row3[::-1] == self.s.inav[0, 1].data.tolist()
-        assert map_row4[::-1] == self.s.inav[1, 1].data.tolist()
-        assert map_row5[::-1] == self.s.inav[2, 1].data.tolist()
+        ## lexicographical ordering -> (y, x, signal)
+        expected = np.array(
+            [map_row0, map_row1, map_row2, map_row3, map_row4, map_row5]
+        )[:, ::-1].reshape(2, 3, -1)
+        np.testing.assert_array_equal(self.s.data, expected)
         np.testing.assert_allclose(self.s.data, self.s_non_uniform.data)
 
     def test_axes(self):
@@ -971,7 +965,7 @@ class TestMap:
             },
         }
 
-        uniform_axis_manager = deepcopy(self.s.axes_manager.as_dictionary())
+        uniform_axis_manager = self.s.axes_manager.as_dictionary()
 
         np.testing.assert_allclose(
             uniform_axis_manager["axis-2"].pop("scale"), 1.5416, atol=0.0001
@@ -1014,3 +1008,63 @@ class TestGlue:
             metadata["Acquisition_instrument"]["Detector"]["glued_spectrum_windows"], 4
         )
         assert metadata["Acquisition_instrument"]["Detector"]["glued_spectrum"] == True
+
+
+@pytest.mark.parametrize(
+    "rows",
+    (
+        ["275.5 214.5 206\n", "\t-1.25e3 +0.001 -0 ", "7E-2 1234567.125 .5"],
+        # fallback to np.fromstring
+        ["1.5 nan inf", "2.5"],
+        ["1e-30 1.2345678901234567"],
+    ),
+)
+@pytest.mark.parametrize("numba_text_size", (0, 2**16))
+def test_rows_to_array(rows, numba_text_size, monkeypatch):
+    from rsciio.jobinyvon import _api
+    from rsciio.jobinyvon._api import JobinYvonXMLReader
+
+    monkeypatch.setattr(_api, "_NUMBA_TEXT_SIZE", numba_text_size)
+    data = JobinYvonXMLReader._rows_to_array(rows)
+    expected = np.fromstring(" ".join(rows), sep=" ")
+    np.testing.assert_array_equal(data, expected)
+    np.testing.assert_array_equal(np.signbit(data), np.signbit(expected))
+
+
+@pytest.mark.parametrize("dtype", (None, "float32", "float64"))
+def test_dtype(dtype):
+    s = hs.load(testfile_map_path, reader="JobinYvon", dtype=dtype)
+    # the rows of the file are stored as floats
+    assert s.data.dtype == (dtype or "float32")
+
+
+def test_dtype_ignores_row_format(tmp_path):
+    fname = tmp_path / "test_integer.xml"
+    text = testfile_map_path.read_text(encoding="utf-8")
+    fname.write_text(
+        text.replace('<LSX_Row Format="6"', '<LSX_Row Format="4"'), encoding="utf-8"
+    )
+    s = hs.load(fname, reader="JobinYvon")
+    # the format of the rows isn't used to choose the dtype, as reading
+    # fractional values as integers would truncate them
+    assert s.data.dtype == "float32"
+    s_ref = hs.load(testfile_map_path, reader="JobinYvon")
+    assert np.any(s_ref.data % 1)
+    np.testing.assert_array_equal(s.data, s_ref.data)
+
+
+@pytest.mark.parametrize(
+    "old, new, match",
+    (
+        ('Index="1" Size="34"', 'Index="1" Size="35"', "different sizes"),
+        ('Size="34"', 'Size="33"', "204 values were read"),
+    ),
+)
+def test_row_size_mismatch(tmp_path, old, new, match):
+    fname = tmp_path / "test_row_size.xml"
+    text = testfile_map_path.read_text(encoding="utf-8")
+    # only change the size of the data rows
+    text = re.sub(f"(<LSX_Row [^>]*){old}", rf"\g<1>{new}", text)
+    fname.write_text(text, encoding="utf-8")
+    with pytest.raises(ValueError, match=match):
+        hs.load(fname, reader="JobinYvon")
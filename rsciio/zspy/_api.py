@@ -30,7 +30,12 @@ from rsciio._docstrings import (
     RETURNS_DOC,
     SIGNAL_DOC,
 )
-from rsciio._hierarchical import HierarchicalWriter, HierarchicalReader, version
+from rsciio._hierarchical import (
+    HierarchicalWriter,
+    HierarchicalReader,
+    version,
+    _SLASH_TRANS,
+)
 
 
 _logger = logging.getLogger(__name__)
@@ -168,14 +173,11 @@ def file_writer(
     _logger.debug(f"Zarr store: {store}")
 
     f = zarr.open_group(store=store, mode=mode)
-    f.attrs["file_format"] = "ZSpy"
-    f.attrs["file_format_version"] = version
+    f.attrs.update({"file_format": "ZSpy", "file_format_version": version})
     exps = f.require_group("Experiments")
     title = signal["metadata"]["General"]["title"]
-    group_name = title if title else "__unnamed__"
     # / is a invalid character, see https://github.com/hyperspy/hyperspy/issues/942
-    if "/" in group_name:
-        group_name = group_name.replace("/", "-")
+    group_name = title.translate(_SLASH_TRANS) if title else "__unnamed__"
     expg = exps.require_group(group_name)
 
     writer = ZspyWriter(